@@ -6,6 +6,7 @@ Modify these values to tune system behavior.
 """
 
 import os
+import sys
 
 # ============================================================================
 # FILE PATHS
@@ -19,6 +20,9 @@ PICTURES_PATH = os.path.join(BASE_PATH, "pictures")
 THUMBS_PATH = os.path.join(BASE_PATH, "thumbs")
 TMP_PATH = os.path.join(BASE_PATH, "tmp")
 
+# All directories the system needs at runtime (created at startup)
+_DIRECTORIES = (VIDEO_PATH, PICTURES_PATH, THUMBS_PATH, TMP_PATH)
+
 # ============================================================================
 # CIRCULAR BUFFER SETTINGS
 # ============================================================================
@@ -63,6 +67,9 @@ CIRCULAR_BUFFER_MAX_CHUNKS = 1000
 # Safety limit to prevent runaway memory usage
 CIRCULAR_BUFFER_MAX_BYTES = 50 * 1024 * 1024  # 50 MB
 
+# Derived display value (computed once at import, not per print/validate)
+CIRCULAR_BUFFER_MAX_MB = CIRCULAR_BUFFER_MAX_BYTES >> 20
+
 # NOTE: BUFFER_DURATION_SECONDS removed - now capacity-driven
 # The actual duration will be logged during operation
 
@@ -76,6 +83,9 @@ VIDEO_FRAMERATE = 15
 # 10Mbps provides good quality at 1080p
 VIDEO_BITRATE = 3000000
 
+# Derived display value (computed once at import)
+VIDEO_BITRATE_MBPS = VIDEO_BITRATE / 1_000_000
+
 # ============================================================================
 # PICTURE CAPTURE SETTINGS
 # ============================================================================
@@ -146,6 +156,12 @@ LIVESTREAM_FRAMERATE = 10
 # MJPEG stream quality (lower than saved images to reduce bandwidth)
 LIVESTREAM_JPEG_QUALITY = 65
 
+# Maximum stream frame width (pixels). Frames wider than this are
+# downscaled before JPEG encode - encode cost and network bytes scale
+# with pixel count, and browsers rarely display the stream full-size.
+# Matches the 2x-subsampled pre-encode the capture thread produces.
+LIVESTREAM_MAX_WIDTH = 640
+
 # ============================================================================
 # LOGGING SETTINGS
 # ============================================================================
@@ -154,6 +170,21 @@ LIVESTREAM_JPEG_QUALITY = 65
 # Batching reduces SD card writes
 LOG_BATCH_INTERVAL = 10
 
+# Minimum level echoed to the console ("INFO", "WARNING" or "ERROR").
+# Database logging always records everything; this only gates the
+# per-call stdout write, which costs a formatted string + I/O each time.
+CONSOLE_LOG_LEVEL = "INFO"
+
+# Queue depth that triggers an immediate flush instead of waiting out
+# the batch interval (bursts hit disk promptly; idle periods still only
+# wake the writer every LOG_BATCH_INTERVAL)
+LOG_FLUSH_HIGH_WATERMARK = 200
+
+# Per-call database diagnostics (one line per INSERT/UPDATE).
+# Off in production: stdout goes to the journal and each print takes the
+# stdio lock on the Thread 3 critical path.
+DEBUG_DB = False
+
 # ============================================================================
 # SYSTEM SETTINGS
 # ============================================================================
@@ -166,6 +197,11 @@ CAMERA_WARMUP_SECONDS = 2
 # Maximum time to wait for threads to stop cleanly
 SHUTDOWN_TIMEOUT_SECONDS = 10
 
+# How often the background GC maintenance thread runs a full collection
+# (seconds). The generational collector is disabled while the camera is
+# running - periodic gc.collect() calls would stall the capture thread.
+GC_COLLECT_INTERVAL_SECONDS = 60
+
 # ============================================================================
 # DIRECTORY CREATION
 # ============================================================================
@@ -175,14 +211,7 @@ def ensure_directories():
     Create all required directories if they don't exist.
     Should be called during system initialization.
     """
-    directories = [
-        VIDEO_PATH,
-        PICTURES_PATH,
-        THUMBS_PATH,
-        TMP_PATH
-    ]
-    
-    for directory in directories:
+    for directory in _DIRECTORIES:
         os.makedirs(directory, exist_ok=True)
         print(f"Directory verified: {directory}")
 
@@ -219,9 +248,9 @@ def validate_config():
         print(f"Warning: High buffer capacity {CIRCULAR_BUFFER_MAX_CHUNKS} chunks "
               f"(may use excessive memory)")
     
-    if CIRCULAR_BUFFER_MAX_BYTES > 100 * 1024 * 1024:
+    if CIRCULAR_BUFFER_MAX_MB > 100:
         print(f"Warning: Buffer memory limit very high "
-              f"({CIRCULAR_BUFFER_MAX_BYTES/(1024*1024):.0f} MB)")
+              f"({CIRCULAR_BUFFER_MAX_MB} MB)")
     
     print("Configuration validation complete")
 
@@ -233,41 +262,49 @@ def print_config():
     """
     Print current configuration for verification.
     Useful during startup and debugging.
+
+    Built as one string and written in a single call: ~25 separate
+    print() calls each take the stdout lock and flush through journald
+    capture at boot, and interleave with other threads' output.
     """
-    print("\n" + "="*60)
-    print("Security Camera System - Configuration")
-    print("="*60)
-    print(f"\nPaths:")
-    print(f"  Database:   {DATABASE_PATH}")
-    print(f"  Videos:     {VIDEO_PATH}")
-    print(f"  Pictures:   {PICTURES_PATH}")
-    print(f"  Thumbnails: {THUMBS_PATH}")
-    
-    print(f"\nVideo Settings:")
-    print(f"  Resolution: {VIDEO_RESOLUTION[0]}x{VIDEO_RESOLUTION[1]}")
-    print(f"  Framerate:  {VIDEO_FRAMERATE} fps")
-    print(f"  Bitrate:    {VIDEO_BITRATE/1000000:.1f} Mbps")
-    print(f"\nCircular Buffer (Capacity-Driven):")
-    print(f"  Max chunks: {CIRCULAR_BUFFER_MAX_CHUNKS}")
-    print(f"  Max memory: {CIRCULAR_BUFFER_MAX_BYTES/(1024*1024):.1f} MB")
-    print(f"  Target:     ~{CIRCULAR_BUFFER_SECONDS}s (actual varies)")
-    print(f"  Post-motion fill target: {POST_MOTION_BUFFER_FILL_PERCENT*100:.0f}% (~{int(CIRCULAR_BUFFER_MAX_CHUNKS*POST_MOTION_BUFFER_FILL_PERCENT)} chunks)")
-    print(f"  Post-motion timeout: {POST_MOTION_TIMEOUT_SECONDS}s")
-    
-    print(f"\nMotion Detection:")
-    print(f"  Threshold:   {MOTION_THRESHOLD}")
-    print(f"  Sensitivity: {MOTION_SENSITIVITY} pixels")
-    print(f"  Cooldown:    {MOTION_COOLDOWN_SECONDS} seconds")
-    print(f"  Check every: {PICTURE_CAPTURE_INTERVAL} seconds")
-    
-    print(f"\nStreaming:")
-    print(f"  Port:        {LIVESTREAM_PORT}")
-    print(f"  Framerate:   {LIVESTREAM_FRAMERATE} fps")
-    
-    print(f"\nLogging:")
-    print(f"  Batch every: {LOG_BATCH_INTERVAL} seconds")
-    
-    print("="*60 + "\n")
+    sys.stdout.write(f"""
+{'='*60}
+Security Camera System - Configuration
+{'='*60}
+
+Paths:
+  Database:   {DATABASE_PATH}
+  Videos:     {VIDEO_PATH}
+  Pictures:   {PICTURES_PATH}
+  Thumbnails: {THUMBS_PATH}
+
+Video Settings:
+  Resolution: {VIDEO_RESOLUTION[0]}x{VIDEO_RESOLUTION[1]}
+  Framerate:  {VIDEO_FRAMERATE} fps
+  Bitrate:    {VIDEO_BITRATE_MBPS:.1f} Mbps
+
+Circular Buffer (Capacity-Driven):
+  Max chunks: {CIRCULAR_BUFFER_MAX_CHUNKS}
+  Max memory: {CIRCULAR_BUFFER_MAX_MB} MB
+  Target:     ~{CIRCULAR_BUFFER_SECONDS}s (actual varies)
+  Post-motion fill target: {POST_MOTION_BUFFER_FILL_PERCENT*100:.0f}% (~{int(CIRCULAR_BUFFER_MAX_CHUNKS*POST_MOTION_BUFFER_FILL_PERCENT)} chunks)
+  Post-motion timeout: {POST_MOTION_TIMEOUT_SECONDS}s
+
+Motion Detection:
+  Threshold:   {MOTION_THRESHOLD}
+  Sensitivity: {MOTION_SENSITIVITY} pixels
+  Cooldown:    {MOTION_COOLDOWN_SECONDS} seconds
+  Check every: {PICTURE_CAPTURE_INTERVAL} seconds
+
+Streaming:
+  Port:        {LIVESTREAM_PORT}
+  Framerate:   {LIVESTREAM_FRAMERATE} fps
+
+Logging:
+  Batch every: {LOG_BATCH_INTERVAL} seconds
+{'='*60}
+
+""")
 
 # ============================================================================
 # USAGE EXAMPLE
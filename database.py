@@ -3,13 +3,17 @@ Security Camera System - Database Module
 =========================================
 Centralized database operations for all threads.
 Uses SQLite with WAL mode for better concurrent access.
-Each method creates short-lived connections for thread safety.
+Each thread reuses one long-lived connection (thread-local).
 """
 
+import atexit
+import queue
 import sqlite3
 import os
+import threading
+import time
 from datetime import datetime
-from config import DATABASE_PATH
+from config import DATABASE_PATH, DEBUG_DB
 
 
 # ============================================================================
@@ -20,68 +24,235 @@ def adapt_datetime(dt):
     """
     Convert datetime to ISO format string for SQLite.
     Required for Python 3.12+ compatibility.
-    
+
     Args:
         dt (datetime): Datetime object to convert
-        
+
     Returns:
         str: ISO format string
     """
     return dt.isoformat() if dt else None
 
 
+# Registered once: the driver converts bound datetime objects through the
+# adapter in C-managed dispatch, so callers pass datetimes directly
+# instead of wrapping every bind in adapt_datetime()
+sqlite3.register_adapter(datetime, adapt_datetime)
+
+# RETURNING needs SQLite 3.35+ (2021); older Pi OS images fall back to
+# the classic lastrowid read
+_HAVE_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+
 class EventDatabase:
     """
     Centralized database interface for all system components.
     
-    Thread-safe through short-lived connections and SQLite's WAL mode.
-    All threads use this class to interact with the database.
-    
+    Thread-safe through per-thread cached connections and SQLite's WAL
+    mode. All threads use this class to interact with the database.
+
     Usage:
         db = EventDatabase()
         event_id = db.add_new_event(timestamp, score, image_path)
         db.save_video(event_id, video_path)
     """
-    
+
+    # Hot-path SQL as class constants: sqlite3 keeps a per-connection LRU
+    # of compiled statements keyed by the SQL text, so passing the exact
+    # same string object every call skips the VDBE parse+plan step on all
+    # but the first execution
+    _SQL_INSERT_EVENT = """
+        INSERT INTO events (timestamp, motion_score, image_a_path)
+        VALUES (?, ?, ?)
+    """
+    _SQL_INSERT_EVENT_RETURNING = _SQL_INSERT_EVENT + " RETURNING id"
+    _SQL_UPDATE_PICTURE_B = """
+        UPDATE events
+        SET image_b_path = ?, updated_at = CURRENT_TIMESTAMP
+        WHERE id = ?
+    """
+    _SQL_UPDATE_THUMBNAIL = """
+        UPDATE events
+        SET thumbnail_path = ?, updated_at = CURRENT_TIMESTAMP
+        WHERE id = ?
+    """
+    _SQL_UPDATE_VIDEO_WITH_DURATION = """
+        UPDATE events
+        SET video_path = ?, duration_seconds = ?, updated_at = CURRENT_TIMESTAMP
+        WHERE id = ?
+    """
+    _SQL_UPDATE_VIDEO = """
+        UPDATE events
+        SET video_path = ?, updated_at = CURRENT_TIMESTAMP
+        WHERE id = ?
+    """
+    # COALESCE keeps the existing column value when a field is passed as
+    # None, so one statement serves both full and partial finalization
+    _SQL_FINALIZE_EVENT = """
+        UPDATE events
+        SET image_b_path = COALESCE(?, image_b_path),
+            thumbnail_path = COALESCE(?, thumbnail_path),
+            video_path = COALESCE(?, video_path),
+            duration_seconds = COALESCE(?, duration_seconds),
+            updated_at = CURRENT_TIMESTAMP
+        WHERE id = ?
+    """
+    _SQL_GET_STREAMING = "SELECT streaming FROM system_control WHERE id = 1"
+    # Upsert: creates the singleton row on first write, updates it after.
+    # One statement covers both cases, so it shares a single slot in the
+    # statement cache and the schema needs no seed insert.
+    _SQL_SET_STREAMING = """
+        INSERT INTO system_control (id, streaming, updated_at)
+        VALUES (1, ?, CURRENT_TIMESTAMP)
+        ON CONFLICT(id) DO UPDATE
+        SET streaming = excluded.streaming, updated_at = CURRENT_TIMESTAMP
+    """
+    _SQL_INSERT_LOG = """
+        INSERT INTO logs (timestamp, level, message, count)
+        VALUES (?, ?, ?, ?)
+    """
+
     def __init__(self, db_path=None):
         """
         Initialize database connection and create schema if needed.
-        
+
         Args:
-            db_path (str, optional): Path to database file. 
+            db_path (str, optional): Path to database file.
                                     Defaults to DATABASE_PATH from config.
         """
         self.db_path = db_path or DATABASE_PATH
-        
+
         # Ensure database directory exists
         db_dir = os.path.dirname(self.db_path)
         if db_dir and not os.path.exists(db_dir):
             os.makedirs(db_dir, exist_ok=True)
-        
+
+        # One cached connection per thread: opening a connection re-parses
+        # the database header and re-maps the WAL/SHM files, which used to
+        # happen on every single query from Threads 2/3/4
+        self._local = threading.local()
+        self._all_conns = []
+        self._conns_lock = threading.Lock()
+
+        # Short-TTL cache for the streaming flag: several threads poll
+        # it on second-scale ticks, and each uncached read is a SQLite
+        # round-trip. Stale reads are bounded by the TTL.
+        self._flag = 0
+        self._flag_ts = 0.0
+
+        # Log entries queue here and one flusher thread commits them in
+        # 1-second batches - callers never block on a WAL commit
+        self._log_queue = queue.SimpleQueue()
+        self._log_stop = threading.Event()
+        self._log_flusher = threading.Thread(
+            target=self._log_flusher_loop,
+            name="DBLogFlusher",
+            daemon=True
+        )
+
+        # Periodic maintenance: PRAGMA optimize refreshes planner stats,
+        # and a nightly truncating checkpoint keeps the WAL file from
+        # accumulating on long-running deployments
+        self._maint_stop = threading.Event()
+        self._maint_thread = threading.Thread(
+            target=self._maintenance_loop,
+            name="DBMaintenance",
+            daemon=True
+        )
+
+        atexit.register(self._close_all)
+
         # Initialize schema on first run
         self._init_schema()
-        
+        self._log_flusher.start()
+        self._maint_thread.start()
+
         print(f"EventDatabase initialized: {self.db_path}")
-    
+
     def get_connection(self):
         """
-        Create a new database connection with WAL mode enabled.
-        
+        Return this thread's cached connection, opening it on first use.
+
         WAL (Write-Ahead Logging) mode benefits:
         - Readers don't block writers
-        - Writers don't block readers  
+        - Writers don't block readers
         - Better concurrency for multi-threaded access
-        
+
+        The connection is opened once per thread and reused for the
+        process lifetime; callers must NOT close it.
+
         Returns:
-            sqlite3.Connection: Database connection
+            sqlite3.Connection: This thread's database connection
         """
-        conn = sqlite3.connect(self.db_path, timeout=30.0)
-        conn.execute("PRAGMA journal_mode=WAL")
-        
-        # Return rows as dictionaries for easier access
-        conn.row_factory = sqlite3.Row
-        
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # check_same_thread=False only so _close_all can close from
+            # the main thread at exit; each conn is still used by exactly
+            # one thread for queries
+            # cached_statements sized to comfortably hold every statement
+            # this class issues (default is 128; headroom is cheap)
+            conn = sqlite3.connect(self.db_path, timeout=30.0,
+                                   check_same_thread=False,
+                                   cached_statements=256)
+            # journal_mode=WAL is a persistent database property set once
+            # in _init_schema; only the genuinely per-connection pragmas
+            # run here. synchronous=NORMAL is safe under WAL (a power cut
+            # can lose the last transactions but never corrupts) and
+            # drops the per-commit fsync that dominated write latency on
+            # the SD card; temp_store/cache_size/mmap_size keep working
+            # pages in RAM instead of round-tripping the card
+            conn.executescript("""
+                PRAGMA synchronous=NORMAL;
+                PRAGMA temp_store=MEMORY;
+                PRAGMA cache_size=-64000;
+                PRAGMA mmap_size=134217728;
+                PRAGMA wal_autocheckpoint=1000;
+                PRAGMA journal_size_limit=67108864;
+            """)
+
+            # Return rows as dictionaries for easier access
+            conn.row_factory = sqlite3.Row
+
+            self._local.conn = conn
+            with self._conns_lock:
+                self._all_conns.append(conn)
+
         return conn
+
+    def _maintenance_loop(self):
+        """
+        Run PRAGMA optimize every 15 minutes and a truncating WAL
+        checkpoint once a day (96 cycles), during what is idle time for
+        a security camera.
+        """
+        cycles = 0
+        while not self._maint_stop.wait(900.0):
+            try:
+                conn = self.get_connection()
+                conn.execute("PRAGMA optimize")
+                cycles += 1
+                if cycles % 96 == 0:
+                    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            except sqlite3.Error as e:
+                print(f"Error in database maintenance: {e}")
+
+    def _close_all(self):
+        """Close every thread's cached connection (atexit/shutdown)."""
+        self._maint_stop.set()
+        # Stop the flusher and write anything still queued before the
+        # connections go away
+        self._log_stop.set()
+        if self._log_flusher.is_alive():
+            self._log_flusher.join(timeout=2.0)
+        self._drain_log_queue()
+
+        with self._conns_lock:
+            conns, self._all_conns = self._all_conns, []
+        for conn in conns:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
     
     def _init_schema(self):
         """
@@ -90,8 +261,20 @@ class EventDatabase:
         """
         conn = self.get_connection()
         cursor = conn.cursor()
-        
+
         try:
+            # WAL persists in the database file, so it only needs to be
+            # set here - not on every connection. The pragma returns the
+            # mode actually in effect: on filesystems without shared-mmap
+            # support (FAT, some network mounts) WAL is refused, so fall
+            # back to a plain rollback journal rather than running with
+            # whatever half-state the refusal left behind.
+            mode = cursor.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+            if mode.lower() != "wal":
+                print(f"Warning: WAL unavailable (journal_mode={mode}), "
+                      "falling back to DELETE journal")
+                cursor.execute("PRAGMA journal_mode=DELETE")
+
             # Events table - main event storage
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS events (
@@ -117,19 +300,27 @@ class EventDatabase:
                     
                     -- Metadata
                     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    updated_at DATETIME
+                    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
                 )
             """)
             
-            # Indexes for performance
+            # Indexes for performance. Every index is maintained on each
+            # INSERT, so keep exactly the two the queries need:
+            # - (ai_processed, timestamp) serves the AI worker's
+            #   "WHERE ai_processed=0 ORDER BY timestamp" without a sort
+            # - timestamp DESC serves get_recent_events' ORDER BY DESC
+            #   without a reverse scan
+            cursor.execute("DROP INDEX IF EXISTS idx_ai_processed")
+            cursor.execute("DROP INDEX IF EXISTS idx_timestamp")
+
             cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_timestamp 
-                ON events(timestamp)
+                CREATE INDEX IF NOT EXISTS idx_events_aiproc_ts
+                ON events(ai_processed, timestamp)
             """)
-            
+
             cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_ai_processed 
-                ON events(ai_processed)
+                CREATE INDEX IF NOT EXISTS idx_events_ts_desc
+                ON events(timestamp DESC)
             """)
             
             # System control table - single row for system state
@@ -141,31 +332,66 @@ class EventDatabase:
                 )
             """)
             
-            # Insert default system_control row if it doesn't exist
-            cursor.execute("""
-                INSERT OR IGNORE INTO system_control (id, streaming) 
-                VALUES (1, 0)
-            """)
-            
-            # Logs table - for batched logging
+            # Logs table - for batched logging. count > 1 means the
+            # logger coalesced identical messages within one batch.
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS logs (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
                     level TEXT,
-                    message TEXT
+                    message TEXT,
+                    count INTEGER NOT NULL DEFAULT 1
                 )
             """)
-            
+
+            # Migrate databases created before the count column existed
+            try:
+                cursor.execute(
+                    "ALTER TABLE logs ADD COLUMN count INTEGER NOT NULL DEFAULT 1")
+            except sqlite3.OperationalError:
+                pass  # Column already present
+
+
             cursor.execute("""
                 CREATE INDEX IF NOT EXISTS idx_log_timestamp 
                 ON logs(timestamp)
             """)
             
             cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_log_level 
+                CREATE INDEX IF NOT EXISTS idx_log_level
                 ON logs(level)
             """)
+
+            # Row counters maintained by triggers: SQLite has no cached
+            # row-count metadata, so COUNT(*) walks the whole table and
+            # gets slower as events/logs accumulate. Seeded from the
+            # real counts on upgrade.
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS counters (
+                    name TEXT PRIMARY KEY,
+                    n INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+
+            cursor.execute("""
+                INSERT OR IGNORE INTO counters (name, n)
+                VALUES ('events', (SELECT COUNT(*) FROM events)),
+                       ('logs', (SELECT COUNT(*) FROM logs))
+            """)
+
+            for table in ('events', 'logs'):
+                cursor.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS {table}_count_insert
+                    AFTER INSERT ON {table} BEGIN
+                        UPDATE counters SET n = n + 1 WHERE name = '{table}';
+                    END
+                """)
+                cursor.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS {table}_count_delete
+                    AFTER DELETE ON {table} BEGIN
+                        UPDATE counters SET n = n - 1 WHERE name = '{table}';
+                    END
+                """)
             
             conn.commit()
             print("Database schema initialized successfully")
@@ -174,8 +400,6 @@ class EventDatabase:
             print(f"Error initializing database schema: {e}")
             conn.rollback()
             raise
-        finally:
-            conn.close()
     
     # ========================================================================
     # EVENT OPERATIONS (Thread 2 and Thread 3)
@@ -207,25 +431,26 @@ class EventDatabase:
         cursor = conn.cursor()
         
         try:
-            now = adapt_datetime(datetime.now())
-            cursor.execute("""
-                INSERT INTO events 
-                (timestamp, motion_score, image_a_path, created_at, updated_at)
-                VALUES (?, ?, ?, ?, ?)
-            """, (adapt_datetime(timestamp), motion_score, image_a_path, now, now))
-            
-            event_id = cursor.lastrowid
+            # created_at/updated_at come from the column defaults;
+            # RETURNING fuses the insert and the id read into one VDBE
+            # program where the library supports it
+            params = (timestamp, motion_score, image_a_path)
+            if _HAVE_RETURNING:
+                event_id = cursor.execute(
+                    self._SQL_INSERT_EVENT_RETURNING, params).fetchone()[0]
+            else:
+                cursor.execute(self._SQL_INSERT_EVENT, params)
+                event_id = cursor.lastrowid
             conn.commit()
             
-            print(f"Event {event_id} created: motion_score={motion_score}")
+            if DEBUG_DB:
+                print(f"Event {event_id} created: motion_score={motion_score}")
             return event_id
             
         except sqlite3.Error as e:
             print(f"Error creating event: {e}")
             conn.rollback()
             raise
-        finally:
-            conn.close()
     
     def save_picture_b(self, event_id, image_b_path):
         """
@@ -242,20 +467,16 @@ class EventDatabase:
         cursor = conn.cursor()
         
         try:
-            cursor.execute("""
-                UPDATE events 
-                SET image_b_path = ?, updated_at = ?
-                WHERE id = ?
-            """, (image_b_path, adapt_datetime(datetime.now()), event_id))
+            cursor.execute(self._SQL_UPDATE_PICTURE_B,
+                           (image_b_path, event_id))
             
             conn.commit()
-            print(f"Event {event_id}: Picture B saved")
+            if DEBUG_DB:
+                print(f"Event {event_id}: Picture B saved")
             
         except sqlite3.Error as e:
             print(f"Error saving Picture B for event {event_id}: {e}")
             conn.rollback()
-        finally:
-            conn.close()
     
     def save_thumbnail(self, event_id, thumbnail_path):
         """
@@ -272,21 +493,51 @@ class EventDatabase:
         cursor = conn.cursor()
         
         try:
-            cursor.execute("""
-                UPDATE events 
-                SET thumbnail_path = ?, updated_at = ?
-                WHERE id = ?
-            """, (thumbnail_path, adapt_datetime(datetime.now()), event_id))
+            cursor.execute(self._SQL_UPDATE_THUMBNAIL,
+                           (thumbnail_path, event_id))
             
             conn.commit()
-            print(f"Event {event_id}: Thumbnail saved")
+            if DEBUG_DB:
+                print(f"Event {event_id}: Thumbnail saved")
             
         except sqlite3.Error as e:
             print(f"Error saving thumbnail for event {event_id}: {e}")
             conn.rollback()
-        finally:
-            conn.close()
     
+    def save_event_stage_b(self, event_id, image_b_path, thumbnail_path):
+        """
+        Update event with Picture B and thumbnail paths in one
+        transaction (Thread 3, T+4s).
+
+        Both paths are known by the time either is written, so grouping
+        the two UPDATEs under one COMMIT halves the WAL commits for this
+        stage of the pipeline.
+
+        Args:
+            event_id (int): Event ID from add_new_event()
+            image_b_path (str): Path to second image
+            thumbnail_path (str): Path to thumbnail image
+
+        Example:
+            db.save_event_stage_b(42, ".../14.23.45_b.jpg", ".../thumbs/14.23.45_b.jpg")
+        """
+        conn = self.get_connection()
+
+        try:
+            # Context manager wraps both statements in a single
+            # BEGIN...COMMIT - one commit instead of two
+            with conn:
+                conn.execute(self._SQL_UPDATE_PICTURE_B,
+                             (image_b_path, event_id))
+                conn.execute(self._SQL_UPDATE_THUMBNAIL,
+                             (thumbnail_path, event_id))
+
+            if DEBUG_DB:
+                print(f"Event {event_id}: Picture B + thumbnail saved")
+
+        except sqlite3.Error as e:
+            print(f"Error saving stage B for event {event_id}: {e}")
+
     def save_video(self, event_id, video_path, duration_seconds=None):
         """
         Update event with video path and optional duration (Thread 3, T+17s).
@@ -307,52 +558,108 @@ class EventDatabase:
             if duration_seconds is not None:
                 # Round to nearest integer for cleaner display
                 duration_int = round(duration_seconds)
-                cursor.execute("""
-                    UPDATE events 
-                    SET video_path = ?, duration_seconds = ?, updated_at = ?
-                    WHERE id = ?
-                """, (video_path, duration_int, adapt_datetime(datetime.now()), event_id))
-                print(f"Event {event_id}: Video saved - duration set to {duration_int}s")
+                cursor.execute(self._SQL_UPDATE_VIDEO_WITH_DURATION,
+                               (video_path, duration_int, event_id))
+                if DEBUG_DB:
+                    print(f"Event {event_id}: Video saved - duration set to {duration_int}s")
             else:
-                cursor.execute("""
-                    UPDATE events 
-                    SET video_path = ?, updated_at = ?
-                    WHERE id = ?
-                """, (video_path, adapt_datetime(datetime.now()), event_id))
+                cursor.execute(self._SQL_UPDATE_VIDEO,
+                               (video_path, event_id))
             
             conn.commit()
-            print(f"Event {event_id}: Video saved - processing complete")
+            if DEBUG_DB:
+                print(f"Event {event_id}: Video saved - processing complete")
             
         except sqlite3.Error as e:
             print(f"Error saving video for event {event_id}: {e}")
             conn.rollback()
-        finally:
-            conn.close()
-    
+
+    def finalize_event(self, event_id, image_b_path=None, thumbnail_path=None,
+                       video_path=None, duration_seconds=None):
+        """
+        Record all files produced for an event in a single transaction
+        (Thread 3, end of event processing).
+
+        By the time Thread 3 finishes an event, every path is known -
+        one UPDATE with all fields replaces three statements and three
+        B-tree row lookups, under a single COMMIT. COALESCE in the SQL
+        leaves a column untouched when its argument is None, so a
+        partially-processed event (e.g. video failed) still records
+        whatever was captured.
+
+        Args:
+            event_id (int): Event ID from add_new_event()
+            image_b_path (str, optional): Path to second image
+            thumbnail_path (str, optional): Path to thumbnail image
+            video_path (str, optional): Path to video file
+            duration_seconds (float, optional): Video duration in seconds
+
+        Example:
+            db.finalize_event(42, ".../b.jpg", ".../thumb.jpg", ".../v.mp4", 33.5)
+        """
+        conn = self.get_connection()
+
+        if duration_seconds is not None:
+            # Round to nearest integer for cleaner display
+            duration_seconds = round(duration_seconds)
+
+        try:
+            with conn:
+                conn.execute(self._SQL_FINALIZE_EVENT,
+                             (image_b_path, thumbnail_path, video_path,
+                              duration_seconds, event_id))
+
+            if DEBUG_DB:
+                print(f"Event {event_id}: Finalized in one UPDATE")
+
+        except sqlite3.Error as e:
+            print(f"Error finalizing event {event_id}: {e}")
+
     # ========================================================================
     # STREAMING CONTROL (Thread 4 and PHP)
     # ========================================================================
     
+    def _get_ro_connection(self):
+        """
+        Return this thread's cached read-only connection, opening it on
+        first use.
+
+        Thread 4 polls the streaming flag once a second forever; under
+        WAL a read-only connection never takes the write lock and never
+        touches the journal, so the poll stays a pure page read even
+        while Threads 2/3 are committing.
+        """
+        conn = getattr(self._local, 'ro_conn', None)
+        if conn is None:
+            conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True,
+                                   timeout=30.0, check_same_thread=False,
+                                   cached_statements=32)
+            # Belt and braces on top of mode=ro: query_only also rejects
+            # writes at the statement level
+            conn.execute("PRAGMA query_only=1")
+            self._local.ro_conn = conn
+            with self._conns_lock:
+                self._all_conns.append(conn)
+
+        return conn
+
     def get_streaming_flag(self):
         """
         Check if livestream is requested (Thread 4).
-        
+
         Returns:
             int: 0 = normal operation, 1 = livestream active
-            
+
         Example:
             if db.get_streaming_flag() == 1:
                 start_livestream()
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
         try:
-            cursor.execute("SELECT streaming FROM system_control WHERE id = 1")
-            row = cursor.fetchone()
-            
+            row = self._get_ro_connection().execute(
+                self._SQL_GET_STREAMING).fetchone()
+
             if row:
-                return row['streaming']
+                return row[0]
             else:
                 # Should never happen, but return safe default
                 return 0
@@ -360,9 +667,27 @@ class EventDatabase:
         except sqlite3.Error as e:
             print(f"Error reading streaming flag: {e}")
             return 0
-        finally:
-            conn.close()
     
+    def get_streaming_flag_cached(self):
+        """
+        get_streaming_flag behind a 0.5s TTL cache.
+
+        For callers that poll the flag on a timer (watchdog, leak check,
+        Thread 4's monitor): within the TTL this is a plain attribute
+        read with no DB round-trip. PHP flips the flag from its own
+        process, so a cached read can lag a web-side change by at most
+        the TTL - harmless at these poll rates. set_streaming_flag
+        refreshes the cache immediately for in-process changes.
+
+        Returns:
+            int: 0 = normal operation, 1 = livestream active
+        """
+        now = time.monotonic()
+        if now - self._flag_ts > 0.5:
+            self._flag = self.get_streaming_flag()
+            self._flag_ts = now
+        return self._flag
+
     def set_streaming_flag(self, streaming):
         """
         Set livestream state (Thread 4 or PHP).
@@ -378,21 +703,20 @@ class EventDatabase:
         cursor = conn.cursor()
         
         try:
-            cursor.execute("""
-                UPDATE system_control 
-                SET streaming = ?, updated_at = ?
-                WHERE id = 1
-            """, (streaming, adapt_datetime(datetime.now())))
-            
+            cursor.execute(self._SQL_SET_STREAMING, (streaming,))
+
             conn.commit()
-            status = "active" if streaming else "inactive"
-            print(f"Streaming flag set to: {status}")
+
+            # Keep the TTL cache coherent for in-process writers
+            self._flag = streaming
+            self._flag_ts = time.monotonic()
+            if DEBUG_DB:
+                status = "active" if streaming else "inactive"
+                print(f"Streaming flag set to: {status}")
             
         except sqlite3.Error as e:
             print(f"Error setting streaming flag: {e}")
             conn.rollback()
-        finally:
-            conn.close()
     
     # ========================================================================
     # LOGGING OPERATIONS (Logger module)
@@ -400,12 +724,18 @@ class EventDatabase:
     
     def add_log_batch(self, log_entries):
         """
-        Insert multiple log entries in a single transaction.
+        Queue log entries for the background flusher.
         Used by logger module for batched writes.
-        
+
+        Returns immediately: entries go onto an in-process queue and the
+        flusher thread coalesces everything queued within a second into
+        one executemany/one commit, so callers never pay a WAL commit on
+        their own thread.
+
         Args:
             log_entries (list): List of tuples (timestamp, level, message)
-            
+                or (timestamp, level, message, count) for coalesced rows
+
         Example:
             logs = [
                 (datetime.now(), "INFO", "System started"),
@@ -415,63 +745,102 @@ class EventDatabase:
         """
         if not log_entries:
             return
-        
+
+        put = self._log_queue.put
+        for entry in log_entries:
+            # Accept legacy 3-tuples (no coalesced count) as count=1
+            if len(entry) == 3:
+                entry = entry + (1,)
+            put(entry)
+
+    def _write_log_batch(self, log_entries):
+        """Write queued log entries in a single transaction (flusher)."""
         conn = self.get_connection()
         cursor = conn.cursor()
-        
+
         try:
-            # Convert datetime objects in log entries
-            adapted_entries = [
-                (adapt_datetime(timestamp), level, message)
-                for timestamp, level, message in log_entries
-            ]
-            
-            cursor.executemany("""
-                INSERT INTO logs (timestamp, level, message)
-                VALUES (?, ?, ?)
-            """, adapted_entries)
-            
+            # Explicit BEGIN IMMEDIATE takes the write lock up front, so
+            # the whole batch is one transaction with no mid-batch lock
+            # upgrade - one WAL commit for N rows
+            cursor.execute("BEGIN IMMEDIATE")
+            cursor.executemany(self._SQL_INSERT_LOG, log_entries)
+
             conn.commit()
-            print(f"Wrote {len(log_entries)} log entries to database")
-            
+            if DEBUG_DB:
+                print(f"Wrote {len(log_entries)} log entries to database")
+
         except sqlite3.Error as e:
             print(f"Error writing log batch: {e}")
             conn.rollback()
-        finally:
-            conn.close()
+
+    def _drain_log_queue(self, max_entries=500):
+        """Pop up to max_entries queued logs and write them in one commit."""
+        batch = []
+        try:
+            while len(batch) < max_entries:
+                batch.append(self._log_queue.get_nowait())
+        except queue.Empty:
+            pass
+
+        if batch:
+            self._write_log_batch(batch)
+
+    def _log_flusher_loop(self):
+        """Flush queued log entries once per second until stopped."""
+        while not self._log_stop.wait(1.0):
+            self._drain_log_queue()
+        # Final drain so shutdown doesn't lose queued entries
+        self._drain_log_queue()
     
     # ========================================================================
     # QUERY OPERATIONS (For testing and maintenance)
     # ========================================================================
     
+    _SQL_RECENT_EVENTS = """
+        SELECT * FROM events
+        ORDER BY timestamp DESC
+        LIMIT ?
+    """
+
+    def iter_recent_events(self, limit=25):
+        """
+        Yield recent events newest-first without materializing them all.
+
+        Rows come out as sqlite3.Row (dict-like: row['id']); fetching in
+        arraysize batches keeps peak allocations flat when a caller
+        paginates with a large limit.
+
+        Args:
+            limit (int): Maximum number of events to yield
+
+        Yields:
+            sqlite3.Row: One event per iteration
+        """
+        cursor = self.get_connection().cursor()
+        cursor.arraysize = 64
+
+        try:
+            cursor.execute(self._SQL_RECENT_EVENTS, (limit,))
+            while True:
+                rows = cursor.fetchmany()
+                if not rows:
+                    break
+                yield from rows
+
+        except sqlite3.Error as e:
+            print(f"Error querying recent events: {e}")
+
     def get_recent_events(self, limit=25):
         """
         Get most recent events for testing/debugging.
-        
+
         Args:
             limit (int): Maximum number of events to return
-            
+
         Returns:
-            list: List of event dictionaries
+            list: List of sqlite3.Row objects (dict-like access)
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        try:
-            cursor.execute("""
-                SELECT * FROM events 
-                ORDER BY timestamp DESC 
-                LIMIT ?
-            """, (limit,))
-            
-            events = [dict(row) for row in cursor.fetchall()]
-            return events
-            
-        except sqlite3.Error as e:
-            print(f"Error querying recent events: {e}")
-            return []
-        finally:
-            conn.close()
+        return list(self.iter_recent_events(limit))
     
     def get_event_count(self):
         """
@@ -484,15 +853,13 @@ class EventDatabase:
         cursor = conn.cursor()
         
         try:
-            cursor.execute("SELECT COUNT(*) as count FROM events")
+            cursor.execute("SELECT n FROM counters WHERE name = 'events'")
             row = cursor.fetchone()
-            return row['count'] if row else 0
-            
+            return row['n'] if row else 0
+
         except sqlite3.Error as e:
             print(f"Error counting events: {e}")
             return 0
-        finally:
-            conn.close()
     
     def get_log_count(self):
         """
@@ -505,15 +872,13 @@ class EventDatabase:
         cursor = conn.cursor()
         
         try:
-            cursor.execute("SELECT COUNT(*) as count FROM logs")
+            cursor.execute("SELECT n FROM counters WHERE name = 'logs'")
             row = cursor.fetchone()
-            return row['count'] if row else 0
-            
+            return row['n'] if row else 0
+
         except sqlite3.Error as e:
             print(f"Error counting logs: {e}")
             return 0
-        finally:
-            conn.close()
 
 
 # ============================================================================
@@ -574,7 +939,10 @@ if __name__ == "__main__":
         (datetime.now(), "ERROR", "Test log message 3")
     ]
     db.add_log_batch(test_logs)
-    
+    # Writes are asynchronous - give the flusher one cycle before counting
+    import time
+    time.sleep(1.5)
+
     # Test 7: Query events
     print("\n--- Test 7: Querying events ---")
     events = db.get_recent_events(limit=5)
@@ -6,12 +6,33 @@ Non-blocking with background writer thread.
 Flushes logs every 5 seconds to reduce SD card writes.
 """
 
+import collections
+import logging
+import os
+import sys
 import threading
 import time
 from datetime import datetime
-from queue import Queue
 from database import EventDatabase
-from config import DATABASE_PATH, LOG_BATCH_INTERVAL
+from config import (
+    DATABASE_PATH,
+    LOG_BATCH_INTERVAL,
+    LOG_FLUSH_HIGH_WATERMARK,
+    CONSOLE_LOG_LEVEL
+)
+
+import logger_journal
+
+# Severity ranking for the console gate; database logging is ungated
+_LEVEL_ORDER = {"INFO": 0, "WARNING": 1, "ERROR": 2}
+_CONSOLE_MIN = _LEVEL_ORDER.get(CONSOLE_LOG_LEVEL, 0)
+
+# Echo backend, decided once at import: under systemd (and with
+# python-systemd installed) records go straight to journald with a real
+# PRIORITY field and nothing to flush at shutdown; otherwise the
+# buffered-stdout path below is used. Database logging is identical in
+# both modes.
+_JOURNAL_ECHO = logger_journal.available()
 
 
 class DatabaseLogger:
@@ -42,7 +63,20 @@ class DatabaseLogger:
                                     Defaults to DATABASE_PATH from config.
         """
         self.db = EventDatabase(db_path or DATABASE_PATH)
-        self.log_queue = Queue()
+
+        # Plain deque + lock instead of queue.Queue: enqueue is a single
+        # append under one lock, and the flusher takes the whole batch
+        # with one atomic swap instead of locking once per entry. The
+        # maxlen bounds memory if the DB writer stalls (SD card busy,
+        # WAL checkpoint) - oldest entries drop rather than growing the
+        # process without limit.
+        self.buf = collections.deque(maxlen=10000)
+        self.buf_lock = threading.Lock()
+
+        # Set by log() when the buffer crosses the high watermark so the
+        # writer flushes a burst immediately instead of letting it sit
+        # for up to LOG_BATCH_INTERVAL seconds
+        self._wake = threading.Event()
         self.running = True
         
         # Start background writer thread
@@ -72,18 +106,36 @@ class DatabaseLogger:
             logger.log("Motion detected at front door")
             logger.log("Failed to save video", level="ERROR")
         """
-        timestamp = datetime.now()
-        
+        # A raw time.time() float is all the enqueue needs - building a
+        # datetime object per call is deferred to the flusher, which
+        # formats once per entry off the caller's thread
+        now = time.time()
+
         # Validate level
         if level not in ["INFO", "WARNING", "ERROR"]:
             level = "INFO"
-        
+
         # Queue for batch writing
-        self.log_queue.put((timestamp, level, message))
-        
-        # Also print to console immediately for real-time monitoring
-        timestamp_str = timestamp.strftime("%Y-%m-%d %H:%M:%S")
-        print(f"[{timestamp_str}] [{level}] {message}")
+        with self.buf_lock:
+            self.buf.append((now, level, message))
+            depth = len(self.buf)
+
+        # Burst protection: wake the writer early once the queue is deep
+        if depth >= LOG_FLUSH_HIGH_WATERMARK:
+            self._wake.set()
+
+        # Console echo, outside the lock and gated by level. Under
+        # systemd it goes to journald (which stamps its own timestamp);
+        # otherwise a single buffered write beats print() - no
+        # separator/end handling and no per-call flush, the batch writer
+        # flushes stdout periodically.
+        if _LEVEL_ORDER[level] >= _CONSOLE_MIN:
+            if _JOURNAL_ECHO:
+                logger_journal.send(message, level)
+            else:
+                timestamp_str = time.strftime("%Y-%m-%d %H:%M:%S",
+                                              time.localtime(now))
+                sys.stdout.write(f"[{timestamp_str}] [{level}] {message}\n")
     
     def _batch_writer(self):
         """
@@ -93,12 +145,18 @@ class DatabaseLogger:
         This is a daemon thread and will automatically stop when main program exits.
         """
         while self.running:
-            # Wait for batch interval
-            time.sleep(LOG_BATCH_INTERVAL)
-            
-            # Flush any queued logs
+            # Wait out the batch interval, or wake early when log()
+            # signals the high watermark
+            self._wake.wait(LOG_BATCH_INTERVAL)
+            self._wake.clear()
+
+            # Flush any queued logs, then push buffered console output
             self._flush_logs()
-    
+            try:
+                sys.stdout.flush()
+            except (ValueError, OSError):
+                pass  # stdout closed (interpreter shutdown)
+
     def _flush_logs(self):
         """
         Write all queued logs to database in a single transaction.
@@ -106,24 +164,39 @@ class DatabaseLogger:
         This is called automatically by the background writer thread,
         but can also be called manually to force immediate write.
         """
-        if self.log_queue.empty():
-            return
-        
-        # Collect all queued logs
-        log_batch = []
-        while not self.log_queue.empty():
-            try:
-                log_entry = self.log_queue.get_nowait()
-                log_batch.append(log_entry)
-            except:
-                break
-        
-        # Write batch to database
-        if log_batch:
-            try:
-                self.db.add_log_batch(log_batch)
-            except Exception as e:
-                print(f"Error writing log batch to database: {e}")
+        # Take everything queued so far in one O(1) swap - a single
+        # lock acquire per flush instead of one per entry, and the
+        # database write below happens with the lock released
+        with self.buf_lock:
+            if not self.buf:
+                return
+            log_batch, self.buf = self.buf, collections.deque(maxlen=10000)
+
+        # Coalesce identical (level, message) pairs emitted within the
+        # same minute into one row carrying a count - a stuck loop
+        # spamming the same line costs one INSERT per minute instead of
+        # hundreds. The first-seen timestamp is kept for the row.
+        grouped = {}
+        for ts, level, msg in log_batch:
+            key = (int(ts) // 60, level, msg)
+            entry = grouped.get(key)
+            if entry is None:
+                grouped[key] = [ts, level, msg, 1]
+            else:
+                entry[3] += 1
+
+        # Write batch to database. The queued floats become ISO strings
+        # here, once per flush, so the hot log() path never constructs a
+        # datetime and parameter binding needs no per-row adapter call.
+        try:
+            self.db.add_log_batch([
+                (datetime.fromtimestamp(ts).isoformat(sep=' ',
+                                                      timespec='seconds'),
+                 level, msg, count)
+                for ts, level, msg, count in grouped.values()
+            ])
+        except Exception as e:
+            print(f"Error writing log batch to database: {e}")
     
     def stop(self):
         """
@@ -134,7 +207,9 @@ class DatabaseLogger:
         """
         print("DatabaseLogger stopping - flushing remaining logs...")
         self.running = False
-        
+        self._wake.set()  # Break the writer out of its interval wait
+
+
         # Flush any remaining logs
         self._flush_logs()
         
@@ -144,6 +219,52 @@ class DatabaseLogger:
         print("DatabaseLogger stopped")
 
 
+class DatabaseLogHandler(logging.Handler):
+    """
+    Bridge stdlib logging records into the batched database logger.
+
+    Third-party modules (picamera2, libcamera bindings) log through the
+    logging package; attaching this handler lands their records in the
+    same logs table and batch pipeline as log(). record.created is
+    already a time.time() float, so emit() appends the same tuple shape
+    the deque expects with no datetime construction per record.
+    """
+
+    def __init__(self, db_logger):
+        super().__init__()
+        self._db_logger = db_logger
+
+    def emit(self, record):
+        try:
+            if record.levelno >= logging.ERROR:
+                level = "ERROR"
+            elif record.levelno >= logging.WARNING:
+                level = "WARNING"
+            else:
+                level = "INFO"
+
+            with self._db_logger.buf_lock:
+                self._db_logger.buf.append(
+                    (record.created, level, record.getMessage()))
+        except Exception:
+            self.handleError(record)
+
+
+def install_stdlib_bridge(name=None, level=logging.WARNING):
+    """
+    Attach a DatabaseLogHandler to the named stdlib logger (root by
+    default) so library warnings/errors reach the database.
+
+    Args:
+        name (str, optional): Logger name; None attaches to the root
+        level (int): Minimum stdlib level to capture (default WARNING)
+    """
+    handler = DatabaseLogHandler(get_logger())
+    handler.setLevel(level)
+    logging.getLogger(name).addHandler(handler)
+    return handler
+
+
 # ============================================================================
 # GLOBAL LOGGER INSTANCE
 # ============================================================================
@@ -215,29 +336,37 @@ def stop_logger():
         _global_logger.stop()
         _global_logger = None
 
+# Page size in MB, computed once - /proc/self/statm reports RSS in pages
+try:
+    _PAGE_MB = os.sysconf('SC_PAGESIZE') / 1048576
+except (ValueError, OSError):
+    _PAGE_MB = 4096 / 1048576
+
+
 def log_memory_usage():
     """
     Log current memory usage for monitoring.
     Useful for debugging memory issues.
+
+    Reads /proc/self/statm directly: one small file read versus psutil's
+    multi-file traversal (and its ~50ms first import). Falls back to
+    resource.getrusage off Linux.
     """
     try:
-        import psutil
-        import os
-        
-        process = psutil.Process(os.getpid())
-        mem_info = process.memory_info()
-        mem_mb = mem_info.rss / (1024 * 1024)  # Convert to MB
-        
+        with open('/proc/self/statm') as f:
+            rss_pages = int(f.read().split()[1])
+        mem_mb = rss_pages * _PAGE_MB
         log(f"Memory usage: {mem_mb:.1f} MB", level="INFO")
-        
-    except ImportError:
-        # psutil not available, use simpler method
-        import resource
-        mem_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
-        mem_mb = mem_kb / 1024  # Convert to MB
-        log(f"Memory usage: ~{mem_mb:.1f} MB", level="INFO")
-    except Exception as e:
-        log(f"Could not log memory usage: {e}", level="WARNING")
+
+    except (OSError, IndexError, ValueError):
+        # /proc not available (non-Linux), use simpler method
+        try:
+            import resource
+            mem_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            mem_mb = mem_kb / 1024  # Convert to MB
+            log(f"Memory usage: ~{mem_mb:.1f} MB", level="INFO")
+        except Exception as e:
+            log(f"Could not log memory usage: {e}", level="WARNING")
 
 # ============================================================================
 # STANDALONE TESTING
@@ -0,0 +1,38 @@
+"""
+Security Camera System - JournalD Log Echo
+===========================================
+Optional journald-native echo for the logger's console path.
+
+Under systemd, stdout is captured by journald line-by-line anyway;
+sending records through systemd.journal.send instead attaches a real
+PRIORITY field (so `journalctl -p warning` filtering works), adds no
+stdio buffer to flush at shutdown, and is fire-and-forget from the
+caller's thread.
+
+logger.py selects this backend when INVOCATION_ID is present in the
+environment (journald sets it for services) and python-systemd is
+installed. The batched database log pipeline is unaffected either way -
+the web UI reads its history from the logs table.
+"""
+
+import os
+
+try:
+    from systemd import journal
+except ImportError:
+    journal = None
+
+# syslog priorities for the three levels the system uses
+_PRIORITY = {"INFO": 6, "WARNING": 4, "ERROR": 3}
+
+
+def available():
+    """True when running under systemd with python-systemd installed."""
+    return journal is not None and bool(os.environ.get('INVOCATION_ID'))
+
+
+def send(message, level="INFO"):
+    """Emit one record to the journal (fire-and-forget, no flush)."""
+    journal.send(message,
+                 PRIORITY=_PRIORITY.get(level, 6),
+                 SYSLOG_IDENTIFIER='sec-cam')
@@ -0,0 +1,71 @@
+"""
+Security Camera System - Runtime Metrics
+=========================================
+Machine-readable counters and gauges for the whole system.
+
+Operational observations (stalls, recoveries, RSS, temperature) used to
+exist only as formatted log lines, so graphing them meant parsing the
+logs table. Components now record them here as named numbers; the MJPEG
+server exposes the lot in Prometheus text format at /metrics, ready for
+scraping without any log parsing. Log lines stay alongside for the
+WARNING/ERROR cases the web UI surfaces.
+
+Counters only ever go up (..._total names, Prometheus convention);
+gauges are point-in-time samples that move both ways.
+
+Usage:
+    metrics.inc('camera_stall_total')
+    metrics.set_gauge('rss_mb', 142.3)
+    text = metrics.render()   # Prometheus exposition format
+"""
+
+import threading
+
+# One dict each, guarded by one lock. These record stalls, recoveries
+# and housekeeping samples - a handful of updates per minute - so a
+# plain lock costs nothing measurable and keeps increments correct
+# without reaching for ctypes atomics.
+_lock = threading.Lock()
+_counters = {}
+_gauges = {}
+
+# Every exported name carries this prefix so the series are easy to
+# find in a shared Prometheus instance
+_PREFIX = 'seccam_'
+
+
+def inc(name, n=1):
+    """Add n to counter `name`, creating it at zero on first use."""
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+def set_gauge(name, value):
+    """Record the current value of gauge `name`."""
+    with _lock:
+        _gauges[name] = value
+
+
+def snapshot():
+    """Consistent copy of all counters and gauges (for tests/debug)."""
+    with _lock:
+        return dict(_counters), dict(_gauges)
+
+
+def render():
+    """
+    All metrics in Prometheus text exposition format.
+
+    Returns:
+        str: One TYPE comment and one sample line per metric, sorted
+            by name so scrapes diff cleanly.
+    """
+    counters, gauges = snapshot()
+    lines = []
+    for name in sorted(counters):
+        lines.append(f"# TYPE {_PREFIX}{name} counter")
+        lines.append(f"{_PREFIX}{name} {counters[name]}")
+    for name in sorted(gauges):
+        lines.append(f"# TYPE {_PREFIX}{name} gauge")
+        lines.append(f"{_PREFIX}{name} {gauges[name]}")
+    return '\n'.join(lines) + '\n'
@@ -14,13 +14,32 @@ When streaming=0:
 - Resumes normal operation (via buffer.stop_streaming())
 """
 
+import socket
+import sqlite3
 import time
 import threading
-from http.server import BaseHTTPRequestHandler, HTTPServer
-from io import BytesIO
-from PIL import Image
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import cv2
+import metrics
 from logger import log
-from config import LIVESTREAM_PORT, LIVESTREAM_JPEG_QUALITY, LIVESTREAM_FRAMERATE
+from config import (
+    DATABASE_PATH,
+    LIVESTREAM_PORT,
+    LIVESTREAM_JPEG_QUALITY,
+    LIVESTREAM_FRAMERATE,
+    LIVESTREAM_MAX_WIDTH
+)
+
+# cv2.imencode parameters built once - libjpeg-turbo's SIMD path, several
+# times faster than a per-frame PIL Image.fromarray/save round trip
+_JPEG_PARAMS = [int(cv2.IMWRITE_JPEG_QUALITY), LIVESTREAM_JPEG_QUALITY]
+
+# Multipart frame framing built once: one C-level %-format per frame
+# instead of re-creating the constant header pieces at 10fps per client
+_HEADER_TMPL = (b'--FRAME\r\n'
+                b'Content-Type: image/jpeg\r\n'
+                b'Content-Length: %d\r\n\r\n')
+_TAIL = b'\r\n'
 
 
 class MJPEGHandler(BaseHTTPRequestHandler):
@@ -30,6 +49,25 @@ class MJPEGHandler(BaseHTTPRequestHandler):
     Serves a single endpoint: /stream.mjpg
     """
     
+    def setup(self):
+        """Tune the accepted socket for frame streaming."""
+        super().setup()
+        try:
+            # Nagle's algorithm can hold small writes up to ~40ms waiting
+            # for ACKs - poison for a stream sending one frame at a time
+            self.connection.setsockopt(socket.IPPROTO_TCP,
+                                       socket.TCP_NODELAY, 1)
+            # Kernel send buffer large enough to absorb a frame without
+            # blocking the handler on a slow client
+            self.connection.setsockopt(socket.SOL_SOCKET,
+                                       socket.SO_SNDBUF, 256 * 1024)
+        except OSError:
+            pass  # Non-fatal; stream still works with default options
+
+        # Rebuild wfile with a buffer sized to hold a whole JPEG frame,
+        # so each frame goes to the kernel as one write
+        self.wfile = self.connection.makefile('wb', buffering=131072)
+
     def do_GET(self):
         """Handle HTTP GET requests."""
         # Strip query string for path matching (e.g., /stream.mjpg?t=123456)
@@ -37,6 +75,8 @@ class MJPEGHandler(BaseHTTPRequestHandler):
         
         if path == '/stream.mjpg':
             self.serve_mjpeg_stream()
+        elif path == '/metrics':
+            self.serve_metrics()
         else:
             self.send_error(404, "Stream not found. Try /stream.mjpg")
     
@@ -66,37 +106,75 @@ class MJPEGHandler(BaseHTTPRequestHandler):
             # Stream frames until client disconnects
             frame_delay = 1.0 / LIVESTREAM_FRAMERATE
             frame_count = 0
-            
+            last_seq = -1
+            frame_cond = self.server.circular_buffer.frame_cond
+
             while True:
-                # Get latest frame from circular buffer
-                frame = self.server.circular_buffer.get_latest_frame_for_livestream()
-                
-                if frame is None:
-                    log(f"[STREAM DEBUG] Frame is None, waiting...", level="WARNING")
-                    time.sleep(0.1)
-                    continue
-                
-                # Convert frame to JPEG
-                try:
-                    img = Image.fromarray(frame)
-                    buffer = BytesIO()
-                    img.save(buffer, format='JPEG', quality=LIVESTREAM_JPEG_QUALITY)
-                    jpeg_bytes = buffer.getvalue()
-                    buffer.close()
-                except Exception as e:
-                    log(f"[STREAM DEBUG] Error encoding JPEG: {e}", level="ERROR")
-                    time.sleep(0.1)
-                    continue
+                # Preferred path: pre-encoded JPEG maintained by the
+                # capture thread - no frame copy, no per-client encode
+                latest = self.server.circular_buffer.get_latest_jpeg()
+
+                if latest is not None:
+                    seq, jpeg_bytes = latest
+                    if seq == last_seq:
+                        # Capture hasn't produced a new frame yet - wait
+                        # for the capture thread's notify rather than
+                        # re-sending the identical JPEG on a timer
+                        with frame_cond:
+                            frame_cond.wait(timeout=frame_delay)
+                        continue
+                    last_seq = seq
+                else:
+                    jpeg_bytes = None
+
+                if jpeg_bytes is None:
+                    # Fallback: encode a frame ourselves (e.g. right
+                    # after streaming starts, before the first
+                    # pre-encode). The read-only view avoids copying the
+                    # full frame - it is encoded immediately, within its
+                    # validity window.
+                    frame = self.server.circular_buffer.get_latest_frame_view()
+
+                    if frame is None:
+                        log(f"[STREAM DEBUG] Frame is None, waiting...", level="WARNING")
+                        with frame_cond:
+                            frame_cond.wait(timeout=0.5)
+                        continue
+
+                    try:
+                        # The ring view is planar YUV420 - convert to
+                        # BGR first so the fallback stream is color,
+                        # within the view's validity window
+                        frame = cv2.cvtColor(frame, cv2.COLOR_YUV2BGR_I420)
+                        # Downscale before encode - JPEG cost is linear
+                        # in pixel count, and viewers don't render the
+                        # stream at capture resolution anyway
+                        if frame.shape[1] > LIVESTREAM_MAX_WIDTH:
+                            scale = LIVESTREAM_MAX_WIDTH / frame.shape[1]
+                            frame = cv2.resize(
+                                frame,
+                                (LIVESTREAM_MAX_WIDTH,
+                                 int(frame.shape[0] * scale)),
+                                interpolation=cv2.INTER_AREA)
+                        ok, buf = cv2.imencode('.jpg', frame, _JPEG_PARAMS)
+                        if not ok:
+                            raise RuntimeError("cv2.imencode returned False")
+                        jpeg_bytes = buf.tobytes()
+                    except Exception as e:
+                        log(f"[STREAM DEBUG] Error encoding JPEG: {e}", level="ERROR")
+                        time.sleep(0.1)
+                        continue
                 
                 try:
-                    # Send frame in browser-compatible format
-                    self.wfile.write(b'--FRAME\r\n')
-                    self.wfile.write(b'Content-Type: image/jpeg\r\n')
-                    self.wfile.write(b'Content-Length: ' + str(len(jpeg_bytes)).encode() + b'\r\n')
-                    self.wfile.write(b'\r\n')
-                    self.wfile.write(jpeg_bytes)
-                    self.wfile.write(b'\r\n')
-                    
+                    # Send frame in browser-compatible format. Built as
+                    # one buffer and written in a single call: five
+                    # separate writes meant up to five send() syscalls
+                    # per frame, and the TCP stack sees one coherent
+                    # segment this way.
+                    self.wfile.write(
+                        (_HEADER_TMPL % len(jpeg_bytes)) + jpeg_bytes + _TAIL)
+                    self.wfile.flush()
+
                     frame_count += 1
                     
                     # Log every 100 frames
@@ -110,8 +188,11 @@ class MJPEGHandler(BaseHTTPRequestHandler):
                     log(f"[STREAM DEBUG] Unexpected error sending frame {frame_count}: {e}", level="ERROR")
                     break
                 
-                # Rate limiting
-                time.sleep(frame_delay)
+                # Rate limit, but wake as soon as a fresh frame arrives
+                # after the delay - no fixed-cadence drift against the
+                # capture rate
+                with frame_cond:
+                    frame_cond.wait(timeout=frame_delay)
                 
         except (BrokenPipeError, ConnectionResetError, OSError):
             log(f"Client disconnected from MJPEG stream: {self.client_address[0]}")
@@ -123,6 +204,22 @@ class MJPEGHandler(BaseHTTPRequestHandler):
             # CRITICAL: Always notify server when client disconnects
             self.server.mjpeg_server.client_disconnected()
     
+    def serve_metrics(self):
+        """
+        Serve system counters in Prometheus text exposition format.
+
+        One-shot response (not a stream), so scrapers can poll it on
+        their own schedule. Note the HTTP server only runs while the
+        streaming flag is up - for always-on scraping, journald/log
+        shipping remains the fallback.
+        """
+        body = metrics.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
     def log_message(self, format, *args):
         """Suppress default HTTP logging (too verbose)."""
         pass
@@ -153,8 +250,37 @@ class MJPEGServer:
         self.monitor_thread = None
         self.active_clients = 0  # Track number of connected clients
         self.client_lock = threading.Lock()  # Thread-safe client counting
-        
+
+        # Control-flag writes fire from transient threading.Timer threads;
+        # routing them through EventDatabase would open (and keep) a new
+        # thread-local connection per timer. One persistent connection
+        # guarded by a lock serves every auto-stop write instead.
+        self._ctrl_conn = sqlite3.connect(DATABASE_PATH, timeout=5.0,
+                                          check_same_thread=False)
+        self._ctrl_lock = threading.Lock()
+
         log("MJPEGServer initialized")
+
+    def attach_buffer(self, new_buffer):
+        """Point the server at a replacement buffer after recovery."""
+        self.buffer = new_buffer
+        if self.server:
+            self.server.circular_buffer = new_buffer
+        log("[WATCHDOG] MJPEG server reattached to new CircularBuffer.")
+
+    def _set_streaming_flag(self, value):
+        """Write the streaming flag on the persistent control connection."""
+        with self._ctrl_lock:
+            self._ctrl_conn.execute(
+                """
+                INSERT INTO system_control (id, streaming, updated_at)
+                VALUES (1, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(id) DO UPDATE
+                SET streaming = excluded.streaming,
+                    updated_at = CURRENT_TIMESTAMP
+                """,
+                (value,))
+            self._ctrl_conn.commit()
     
     def client_connected(self):
         """Called when a client connects to the stream."""
@@ -180,7 +306,7 @@ class MJPEGServer:
             if self.active_clients == 0:
                 log("No clients for 5 seconds - auto-stopping streaming")
                 try:
-                    self.db.set_streaming_flag(0)
+                    self._set_streaming_flag(0)
                 except Exception as e:
                     log(f"Error setting streaming flag to 0: {e}", level="ERROR")
             else:
@@ -209,7 +335,12 @@ class MJPEGServer:
         # Wait for monitor thread
         if self.monitor_thread and self.monitor_thread.is_alive():
             self.monitor_thread.join(timeout=2.0)
-        
+
+        try:
+            self._ctrl_conn.close()
+        except sqlite3.Error:
+            pass
+
         log("MJPEG server stopped")
     
     def _monitor_streaming_flag(self):
@@ -227,8 +358,9 @@ class MJPEGServer:
         
         while self.running:
             try:
-                # Check database flag
-                streaming = self.db.get_streaming_flag()
+                # Check database flag (TTL-cached read; PHP-side changes
+                # are picked up within the cache TTL, well under the 1s poll)
+                streaming = self.db.get_streaming_flag_cached()
                 
                 if streaming == 1 and not server_active:
                     # Start streaming
@@ -258,7 +390,7 @@ class MJPEGServer:
                             log(f"MJPEG monitor: Streaming timeout reached ({STREAMING_TIMEOUT/60:.0f} minutes), stopping server", level="WARNING")
                             # Set flag to 0 in database
                             try:
-                                self.db.set_streaming_flag(0)
+                                self._set_streaming_flag(0)
                             except Exception as e:
                                 log(f"Error setting streaming flag to 0: {e}", level="ERROR")
                             
@@ -280,8 +412,13 @@ class MJPEGServer:
     def _start_http_server(self):
         """Start HTTP server on LIVESTREAM_PORT."""
         try:
-            # Create server
-            self.server = HTTPServer(('0.0.0.0', LIVESTREAM_PORT), MJPEGHandler)
+            # Threading server: each viewer gets its own handler thread,
+            # so a second client no longer stalls behind the first's
+            # socket writes. All threads read the same atomically-swapped
+            # (seq, bytes) JPEG tuple, so no extra locking is needed.
+            self.server = ThreadingHTTPServer(('0.0.0.0', LIVESTREAM_PORT),
+                                              MJPEGHandler)
+            self.server.daemon_threads = True  # Prompt shutdown
             self.server.circular_buffer = self.buffer
             self.server.mjpeg_server = self  # Pass reference to self
             
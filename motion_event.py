@@ -6,9 +6,12 @@ Coordinates motion detection signals between Thread 2 and Thread 3.
 Thread 2 (motion_detector) calls set() when motion detected (non-blocking)
 Thread 3 (event_processor) calls wait_and_get() to wait for motion (blocking)
 
-No queuing needed - timing guarantees sequential processing.
+Payloads ride a small bounded deque: the cooldown normally guarantees
+sequential processing, but if Thread 3 ever falls behind (slow SD card
+during a video save) a burst no longer overwrites the pending event.
 """
 
+import collections
 import threading
 from datetime import datetime
 from logger import log
@@ -39,34 +42,37 @@ class MotionEvent:
         Initialize motion event coordinator.
         """
         self._event = threading.Event()
-        self._data = {}
-        self._lock = threading.Lock()
-        
+
+        # Single-producer/single-consumer payload queue. deque append
+        # and popleft are GIL-atomic, so neither side takes a lock; the
+        # bound means a runaway burst drops the oldest entries instead
+        # of growing without limit. The Event provides the kernel-level
+        # block for the consumer.
+        self._pending = collections.deque(maxlen=64)
+
         log("MotionEvent coordinator initialized")
-    
+
     def set(self, event_id, timestamp):
         """
         Signal that motion was detected (called by Thread 2).
-        
+
         Non-blocking - returns immediately.
         Thread 2 continues to cooldown without waiting.
-        
+
         Args:
             event_id (int): Database event ID for tracking
             timestamp (datetime): When motion occurred
-            
+
         Example:
             motion_event.set(event_id=42, timestamp=datetime.now())
         """
-        with self._lock:
-            self._data = {
-                'event_id': event_id,
-                'timestamp': timestamp
-            }
-        
+        # Enqueued before the Event is set, so a waiter woken by set()
+        # always finds the payload
+        self._pending.append((event_id, timestamp))
+
         # Signal Thread 3 that motion occurred
         self._event.set()
-        
+
         log(f"Motion event set: event_id={event_id}")
     
     def wait_and_get(self):
@@ -89,17 +95,32 @@ class MotionEvent:
         """
         # Block here until Thread 2 calls set()
         # Uses efficient OS-level waiting (no CPU usage)
-        self._event.wait()
-        
-        # Get the event data
-        with self._lock:
-            data = self._data.copy()
-        
-        # Reset event for next motion detection
-        self._event.clear()
-        
-        log(f"Motion event received: event_id={data['event_id']}")
-        
+        while True:
+            self._event.wait()
+            try:
+                event_id, timestamp = self._pending.popleft()
+                break
+            except IndexError:
+                # Woke with nothing queued: reset, but re-signal if a
+                # producer slipped in between the wake and the clear
+                self._event.clear()
+                if self._pending:
+                    self._event.set()
+
+        # Leave the Event set while entries remain so a burst drains
+        # without blocking between items
+        if not self._pending:
+            self._event.clear()
+            if self._pending:
+                self._event.set()
+
+        data = {
+            'event_id': event_id,
+            'timestamp': timestamp
+        }
+
+        log(f"Motion event received: event_id={event_id}")
+
         return data
     
     def is_set(self):
@@ -18,10 +18,17 @@ Usage:
     sudo systemctl start sec-cam
 """
 
+import gc
+import heapq
+import itertools
+import os
 import sys
 import signal
+import threading
 import time
-import subprocess  # Add this line
+import subprocess
+import numpy as np
+import metrics
 from config import (
     DATABASE_PATH,
     ensure_directories,
@@ -36,6 +43,84 @@ from motion_detector import MotionDetector
 from event_processor import EventProcessor
 from mjpeg_server import MJPEGServer
 
+# RSS sampling: /proc/self/statm is opened once at import and re-read
+# with seek(0) - two syscalls per sample, no allocation beyond the tiny
+# read, and no psutil dependency just to ask the kernel one number.
+_PAGE_MB = os.sysconf('SC_PAGESIZE') / (1024 * 1024)
+_statm = open('/proc/self/statm', 'rb', buffering=0)
+
+
+def _read_rss_mb():
+    """Resident set size in MB, from field 1 of /proc/self/statm."""
+    _statm.seek(0)
+    return int(_statm.read().split()[1]) * _PAGE_MB
+
+
+def _spawn_sudo(args):
+    """
+    Launch `sudo <args>` without fork()ing this process.
+
+    Recovery runs exactly when memory is tight, and fork() duplicates
+    the page tables of a large-RSS Python process - on a 1 GB Pi that
+    can itself fail with ENOMEM mid-recovery. posix_spawn goes through
+    vfork on glibc and copies nothing; subprocess.Popen remains the
+    fallback if the spawn fails. Fire-and-forget either way.
+    """
+    argv = ['sudo'] + list(args)
+    try:
+        os.posix_spawn('/usr/bin/sudo', argv, os.environ)
+    except (AttributeError, OSError):
+        subprocess.Popen(argv)
+
+
+# Housekeeping cadences (seconds)
+_MEM_LOG_INTERVAL = 200.0
+_LEAK_CHECK_INTERVAL = 30.0
+_TEMP_CHECK_INTERVAL = 5.0
+_HEALTH_CHECK_INTERVAL = 40.0
+_LEAK_SLOPE_MB_PER_MIN = 4.0   # old rule: 20 MB over 5 minutes
+
+
+class HousekeepingScheduler:
+    """
+    Single dispatcher for all periodic maintenance work.
+
+    The main loop and the watchdog each used to carry their own timer
+    arithmetic (tick counters, cadence masks, deadline tracking). It now
+    lives in one heap of (due, interval, fn) entries driven off the
+    shutdown event: the calling thread sleeps exactly until the next
+    task is due, wakes instantly on shutdown, and adding a periodic task
+    is one register() call instead of another counter in a loop.
+    """
+
+    def __init__(self, shutdown_event):
+        self._shutdown = shutdown_event
+        self._heap = []
+        self._seq = itertools.count()   # Tie-break for equal due times
+
+    def register(self, interval, fn):
+        """Run fn() every interval seconds, first run one interval out."""
+        heapq.heappush(self._heap,
+                       (time.monotonic() + interval, next(self._seq),
+                        interval, fn))
+
+    def run(self):
+        """Dispatch tasks until the shutdown event is set (blocks)."""
+        while self._heap:
+            due = self._heap[0][0]
+            if self._shutdown.wait(timeout=max(0.0, due - time.monotonic())):
+                return
+            if time.monotonic() < due:
+                continue   # Timer granularity woke us a hair early
+            _, _, interval, fn = self._heap[0]
+            heapq.heapreplace(self._heap,
+                              (due + interval, next(self._seq), interval, fn))
+            try:
+                fn()
+            except Exception as e:
+                log(f"Housekeeping task failed: {e}", level="ERROR")
+
+
 class SecurityCameraSystem:
     """
     Main orchestrator for security camera system.
@@ -61,7 +146,25 @@ class SecurityCameraSystem:
 
         # System state
         self.running = False
-        
+
+        # Set to wake the main thread immediately on shutdown; run()
+        # sleeps on this instead of a fixed 1s tick
+        self._shutdown = threading.Event()
+
+        # Housekeeping state (tasks dispatched by the scheduler in run())
+        self._mem_ring = np.zeros(10, dtype=np.float32)  # leak-check window
+        self._mem_idx = 0
+        self._mem_n = 0
+        self._health_checks = 0
+        self._evict_threshold = 0
+        self._last_max_chunks = None
+        try:
+            # Thermal zone fd opened once; each check is a single pread
+            self._temp_fd = os.open('/sys/class/thermal/thermal_zone0/temp',
+                                    os.O_RDONLY)
+        except OSError:
+            self._temp_fd = None   # No thermal zone (dev machine)
+
         log("System initializing...")
     
     def initialize(self):
@@ -79,6 +182,17 @@ class SecurityCameraSystem:
             bool: True if initialization successful, False otherwise
         """
         try:
+            # Step 0: Interpreter tuning. The C extensions (numpy, cv2,
+            # picamera2) are already warmed up - the component imports at
+            # module top pull them in before any worker thread exists.
+            # A longer GIL switch interval (default 5ms) cuts ping-pong
+            # between the mostly-blocking watchdog/orchestrator threads
+            # and the compute-bound detection thread; the blocking
+            # threads release the GIL voluntarily at their waits anyway.
+            sys.setswitchinterval(0.02)
+            if getattr(sys, "_is_gil_enabled", None) and not sys._is_gil_enabled():
+                log("Free-threaded interpreter detected (GIL disabled)")
+
             # Step 1: Validate configuration
             log("Validating configuration...")
             print_config()
@@ -140,127 +254,72 @@ class SecurityCameraSystem:
             return False
 
     def start_camera_watchdog(self):
-        """Enhanced watchdog with power monitoring and buffer health checks."""
-        import threading, time
-        from logger import log
-        
+        """Watchdog thread: camera stall detection and recovery."""
         def watchdog_loop():
-            log("[WATCHDOG] Camera watchdog started with power and buffer monitoring.")
+            log("[WATCHDOG] Camera watchdog started.")
             last_restart_time = 0
             timeout_count = 0
-            check_count = 0
-            
+
             while True:
                 try:
-                    check_count += 1
-                    
-                    # Check thermal throttling
-                    try:
-                        with open('/sys/class/thermal/thermal_zone0/temp', 'r') as f:
-                            temp = int(f.read()) / 1000
-                            if temp > 70:
-                                log(f"[WATCHDOG] High temperature: {temp}°C", level="WARNING")
-                    except:
-                        pass
-                    
                     cb = self.circular_buffer
-                    now = time.time()
-                    frame_age = now - getattr(cb, "last_frame_time", 0)
+
+                    # Sleep the full stall window on the buffer's frame
+                    # condition: a stall fires recovery at exactly 10s
+                    # (the old 5s poll detected it anywhere between 10
+                    # and 15s), and a healthy camera costs one wake per
+                    # window instead of timer polls in between.
+                    got_frame = cb.wait_for_frame(10.0)
                     thread_alive = cb.capture_thread and cb.capture_thread.is_alive()
 
-                    # Check buffer health every 10 cycles (50 seconds)
-                    if check_count % 10 == 0:
-                        health = cb.get_buffer_health()
-                        if health:
-                            current = health['current_chunks']
-                            maximum = health['max_chunks']
-                            utilization = health['utilization_pct']
-                            status = health['status']
-                            evictions = health['eviction_count']
-                            
-                            # Capacity-driven health assessment
-                            if status == "critically_low":
-                                # Buffer suspiciously empty - encoder might have problems
-                                log(f"[WATCHDOG] Buffer critically low: {current}/{maximum} "
-                                    f"chunks ({utilization:.1f}% full) - encoder may have stalled!", 
-                                    level="ERROR")
-                            
-                            elif status == "low":
-                                # Buffer below ideal but not critical
-                                log(f"[WATCHDOG] Buffer low: {current}/{maximum} "
-                                    f"chunks ({utilization:.1f}% full) - still filling or recovering", 
-                                    level="WARNING")
-                            
-                            elif status == "filling":
-                                # Buffer filling normally
-                                log(f"[WATCHDOG] Buffer filling: {current}/{maximum} "
-                                    f"chunks ({utilization:.1f}% full)")
-                            
-                            elif status == "optimal":
-                                # This is what we want! Only log periodically (every 5th check = 4+ minutes)
-                                if check_count % 200 == 0:
-                                    log(f"[WATCHDOG] Buffer optimal: {current}/{maximum} "
-                                        f"chunks ({utilization:.1f}% full), {evictions} total evictions")
-                            
-                            # Warn if excessive evictions (might mean max_chunks too low)
-                            # Only check after system has been running a while
-                            if check_count > 50 and evictions > (maximum * 50):
-                                # More than 50x the buffer size has been evicted
-                                # This means we've cycled through the entire buffer 50+ times
-                                avg_evictions_per_min = evictions / ((check_count * 5) / 60)
-                                log(f"[WATCHDOG] High eviction rate: {evictions} total evictions "
-                                    f"({avg_evictions_per_min:.1f}/min). Consider increasing "
-                                    f"CIRCULAR_BUFFER_MAX_CHUNKS in config.py", 
-                                    level="WARNING")
-                    
-                    # Check for camera stall
-                    if (frame_age > 10) or not thread_alive:
-                        timeout_count += 1
-                        reason = "no new frames" if frame_age > 10 else "capture thread died"
-                        log(f"[WATCHDOG] {reason} (timeout #{timeout_count}) → recovery", "WARNING")
-                        
-                        # Prevent restart storm
-                        if now - last_restart_time < 60:
-                            log("[WATCHDOG] Restart suppressed (< 60s since last)")
-                            time.sleep(5)
-                            continue
-                        
-                        last_restart_time = now
-                        self._perform_full_recovery()
-                        
-                        # If timeouts are frequent, something is seriously wrong
-                        if timeout_count > 10:
-                            log("[WATCHDOG] Too many timeouts (10+) - possible hardware issue", level="ERROR")
-                            timeout_count = 0  # Reset but keep monitoring
-                    else:
-                        # Reset timeout counter on successful frame
-                        if timeout_count > 0 and frame_age < 2:
+                    if got_frame and thread_alive:
+                        if timeout_count > 0:
                             log(f"[WATCHDOG] Camera recovered after {timeout_count} timeouts")
                             timeout_count = 0
-                    
-                    time.sleep(5)
-                    
+                        # Re-arm after a pause - without it the loop
+                        # would wake on every capture at 15fps
+                        time.sleep(5)
+                        continue
+
+                    timeout_count += 1
+                    metrics.inc('camera_stall_total')
+                    reason = "capture thread died" if not thread_alive else "no new frames"
+                    log(f"[WATCHDOG] {reason} (timeout #{timeout_count}) → recovery", "WARNING")
+
+                    # Prevent restart storm
+                    now = time.monotonic()
+                    if now - last_restart_time < 60:
+                        log("[WATCHDOG] Restart suppressed (< 60s since last)")
+                        time.sleep(5)
+                        continue
+
+                    last_restart_time = now
+                    self._perform_full_recovery()
+
+                    # If timeouts are frequent, something is seriously wrong
+                    if timeout_count > 10:
+                        log("[WATCHDOG] Too many timeouts (10+) - possible hardware issue", level="ERROR")
+                        timeout_count = 0  # Reset but keep monitoring
+
                 except Exception as e:
                     log(f"[WATCHDOG] Error: {e}", level="ERROR")
                     time.sleep(5)
-        
+
         threading.Thread(target=watchdog_loop, name="CameraWatchdog", daemon=True).start()
 
     def _perform_full_recovery(self):
         """
         Enhanced camera recovery with aggressive cleanup.
         """
-        from logger import log
-        import time, gc, subprocess
-        
         try:
             log("[WATCHDOG] === CAMERA RECOVERY INITIATED ===")
+            metrics.inc('camera_recovery_total')
             
-            # Pause dependent threads
-            if hasattr(self.motion_detector, "pause"):
-                self.motion_detector.pause()
-            if hasattr(self.event_processor, "pause"):
-                self.event_processor.pause()
+            # Pause dependent threads. pause/resume/attach_buffer are
+            # part of the component contract now - no hasattr probing,
+            # a missing method is a bug that should surface loudly.
+            self.motion_detector.pause()
+            self.event_processor.pause()
             
             # Stop and cleanup buffer
             log("[WATCHDOG] Stopping circular buffer...")
@@ -273,18 +332,24 @@ class SecurityCameraSystem:
             gc.collect()
             time.sleep(2.0)
             
-            # Force kernel to drop caches (helps with CMA)
+            # Force kernel to drop caches (helps with CMA). Direct write
+            # when running as root or with CAP_SYS_ADMIN (the systemd
+            # service does); the sudo-shell fallback forks three
+            # processes for a 2-byte write, so it only runs for
+            # unprivileged dev sessions.
             try:
-                subprocess.run(['sudo', 'sh', '-c', 'echo 1 > /proc/sys/vm/drop_caches'], 
-                            timeout=5, check=False)
-            except:
-                pass
+                with open('/proc/sys/vm/drop_caches', 'w') as f:
+                    f.write('1\n')
+            except OSError:
+                try:
+                    _spawn_sudo(['sh', '-c', 'echo 1 > /proc/sys/vm/drop_caches'])
+                except:
+                    pass
             
             time.sleep(1.0)
             
             # Recreate buffer
             log("[WATCHDOG] Recreating circular buffer...")
-            from circular_buffer import CircularBuffer
             self.circular_buffer = CircularBuffer()
             
             # Restart buffer (picamera2 re-init happens here)
@@ -295,32 +360,23 @@ class SecurityCameraSystem:
             log("[WATCHDOG] Linking motion detector to new buffer...")
             self.circular_buffer.set_motion_detector(self.motion_detector)
             
-            # Update MJPEG server's buffer reference - CRITICAL FIX
-            if self.mjpeg_server:
-                log("[WATCHDOG] Updating MJPEG server buffer reference...")
-                self.mjpeg_server.buffer = self.circular_buffer
-            
-            # Reattach to motion detector
-            if hasattr(self.motion_detector, "attach_buffer"):
-                self.motion_detector.attach_buffer(self.circular_buffer)
-            
-            # Reattach to event processor
-            if hasattr(self.event_processor, "buffer"):
-                self.event_processor.buffer = self.circular_buffer
-            
+            # Reattach every consumer to the replacement buffer
+            self.mjpeg_server.attach_buffer(self.circular_buffer)
+            self.motion_detector.attach_buffer(self.circular_buffer)
+            self.event_processor.attach_buffer(self.circular_buffer)
+
             # Resume threads
-            if hasattr(self.motion_detector, "resume"):
-                self.motion_detector.resume()
-            if hasattr(self.event_processor, "resume"):
-                self.event_processor.resume()
+            self.motion_detector.resume()
+            self.event_processor.resume()
             
             log("[WATCHDOG] === CAMERA RECOVERY COMPLETE ===")
             
         except Exception as e:
+            metrics.inc('recovery_failed_total')
             log(f"[WATCHDOG] Recovery failed: {e}", level="ERROR")
             log("[WATCHDOG] System requires restart - attempting reboot...", level="ERROR")
             try:
-                subprocess.Popen(["sudo", "reboot"])
+                _spawn_sudo(['reboot'])
             except:
                 log("[WATCHDOG] Reboot failed - manual intervention required", level="ERROR")
             
@@ -403,7 +459,8 @@ class SecurityCameraSystem:
         print("="*60)
         
         self.running = False
-        
+        self._shutdown.set()
+
         try:
             # Step 1: Stop motion detector (Thread 2)
             if self.motion_detector:
@@ -435,6 +492,133 @@ class SecurityCameraSystem:
             print(f"Error during shutdown: {e}\n")
             log(f"Error during shutdown: {e}", level="ERROR")
     
+    def _check_temperature(self):
+        """Housekeeping: warn when the SoC runs hot."""
+        if self._temp_fd is None:
+            return
+        try:
+            temp = int(os.pread(self._temp_fd, 16, 0)) // 1000
+            metrics.set_gauge('cpu_temp_c', temp)
+            if temp > 70:
+                log(f"[WATCHDOG] High temperature: {temp}°C", level="WARNING")
+        except (OSError, ValueError):
+            pass
+
+    def _check_buffer_health(self):
+        """Housekeeping: capacity-driven buffer health assessment."""
+        cb = self.circular_buffer
+        if cb is None:
+            return
+        health = cb.get_buffer_health()
+        if not health:
+            return
+
+        self._health_checks += 1
+        current = health['current_chunks']
+        maximum = health['max_chunks']
+        utilization = health['utilization_pct']
+        status = health['status']
+        evictions = health['eviction_count']
+
+        # The routine observations (fill level, cumulative evictions)
+        # are metrics, not log lines - the INFO logs below stay only as
+        # the throttled human-readable trace
+        metrics.set_gauge('buffer_chunks', current)
+        metrics.set_gauge('buffer_utilization_pct', round(utilization, 1))
+        metrics.set_gauge('buffer_evictions', evictions)
+
+        # Eviction-warning threshold cached; recomputed only when a
+        # recovery installs a buffer with a different capacity
+        if maximum != self._last_max_chunks:
+            self._evict_threshold = maximum * 50
+            self._last_max_chunks = maximum
+
+        if status == "critically_low":
+            # Buffer suspiciously empty - encoder might have problems
+            log(f"[WATCHDOG] Buffer critically low: {current}/{maximum} "
+                f"chunks ({utilization:.1f}% full) - encoder may have stalled!",
+                level="ERROR")
+
+        elif status == "low":
+            # Buffer below ideal but not critical
+            log(f"[WATCHDOG] Buffer low: {current}/{maximum} "
+                f"chunks ({utilization:.1f}% full) - still filling or recovering",
+                level="WARNING")
+
+        elif status == "filling":
+            # Buffer filling normally
+            log(f"[WATCHDOG] Buffer filling: {current}/{maximum} "
+                f"chunks ({utilization:.1f}% full)")
+
+        elif status == "optimal":
+            # This is what we want! Only log periodically (every 32nd
+            # check = 21+ minutes)
+            if self._health_checks & 31 == 0:
+                log(f"[WATCHDOG] Buffer optimal: {current}/{maximum} "
+                    f"chunks ({utilization:.1f}% full), {evictions} total evictions")
+
+        # Warn if excessive evictions (might mean max_chunks too low)
+        # Only check after the system has been running a while
+        if self._health_checks > 6 and evictions > self._evict_threshold:
+            elapsed_min = self._health_checks * _HEALTH_CHECK_INTERVAL / 60
+            avg_evictions_per_min = evictions / elapsed_min
+            log(f"[WATCHDOG] High eviction rate: {evictions} total evictions "
+                f"({avg_evictions_per_min:.1f}/min). Consider increasing "
+                f"CIRCULAR_BUFFER_MAX_CHUNKS in config.py",
+                level="WARNING")
+
+    def _log_rss(self):
+        """Housekeeping: periodic RSS line for memory debugging."""
+        rss_mb = _read_rss_mb()
+        metrics.set_gauge('rss_mb', round(rss_mb, 1))
+        log(f"[MEMDEBUG] RSS={rss_mb:.1f} MB")
+
+    def _leak_check(self):
+        """
+        Housekeeping: flag sustained RSS growth.
+
+        Samples land in a fixed 10-slot ring (5 minutes of history); a
+        line fitted through the chronological window must show sustained
+        growth, so one transient spike doesn't trip the alert.
+        """
+        rss_mb = _read_rss_mb()
+        self._mem_ring[self._mem_idx] = rss_mb
+        self._mem_idx = (self._mem_idx + 1) % 10
+        self._mem_n = min(self._mem_n + 1, 10)
+
+        if self._mem_n < 3:
+            return
+
+        if self._mem_n < 10:
+            ordered = self._mem_ring[:self._mem_n]
+        else:
+            ordered = np.concatenate((self._mem_ring[self._mem_idx:],
+                                      self._mem_ring[:self._mem_idx]))
+        slope = np.polyfit(np.arange(self._mem_n), ordered, 1)[0]
+        growth_per_min = slope * (60.0 / _LEAK_CHECK_INTERVAL)
+
+        # Check if streaming is active (growth expected during streaming)
+        streaming_active = False
+        try:
+            streaming_active = self.db.get_streaming_flag_cached() == 1
+        except:
+            pass
+
+        # Only flag leak if NOT streaming and memory is growing
+        if growth_per_min > _LEAK_SLOPE_MB_PER_MIN and not streaming_active:
+            metrics.inc('leak_alert_total')
+            log(f"MEMORY LEAK DETECTED: {growth_per_min:.1f} MB/min "
+                f"sustained growth over {self._mem_n * 30}s", level="ERROR")
+            log(f"Current RSS: {rss_mb:.1f} MB", level="ERROR")
+
+            # Force aggressive GC
+            gc.collect()
+
+            new_rss = _read_rss_mb()
+            freed = rss_mb - new_rss
+            if freed > 1:
+                log(f"Emergency GC freed {freed:.1f} MB", level="WARNING")
+
     def run(self):
         """
         Main run loop - keeps system alive until interrupted.
@@ -442,70 +626,27 @@ class SecurityCameraSystem:
         Returns:
             int: Exit code (0 for success, 1 for failure)
         """
-        import psutil
-        import os
-        import gc
-        
         # Initialize
         if not self.initialize():
             return 1
-        
+
         # Start
         if not self.start():
             self.stop()
             return 1
-        
-        # Run until interrupted
+
+        # Run until interrupted. All periodic housekeeping dispatches
+        # from one deadline-driven scheduler on the main thread; the
+        # watchdog thread is left with stall detection only.
         try:
-            proc = psutil.Process(os.getpid())
-            loop_counter = 0
-            last_leak_check = time.time()
-            mem_samples = []
-            
-            while self.running:
-                time.sleep(1.0)
-                loop_counter += 1
-                
-                # Regular memory logging every 50 seconds
-                if loop_counter % 200 == 0:
-                    rss_mb = proc.memory_info().rss / (1024 * 1024)
-                    log(f"[MEMDEBUG] RSS={rss_mb:.1f} MB")
-                
-                # Leak detection every 30 seconds
-                if time.time() - last_leak_check >= 30:
-                    rss_mb = proc.memory_info().rss / (1024 * 1024)
-                    mem_samples.append(rss_mb)
-                    
-                    # Keep last 10 samples (5 minutes of history)
-                    if len(mem_samples) > 10:
-                        mem_samples.pop(0)
-                    
-                    # Detect leak (memory growing consistently)
-                    if len(mem_samples) >= 3:
-                        trend = mem_samples[-1] - mem_samples[0]
-                        
-                        # Check if streaming is active (growth expected during streaming)
-                        streaming_active = False
-                        try:
-                            streaming_active = self.db.get_streaming_flag() == 1
-                        except:
-                            pass
-                        
-                        # Only flag leak if NOT streaming and memory is growing
-                        if trend > 20 and not streaming_active:  # Growing by 20+ MB
-                            log(f"MEMORY LEAK DETECTED: {trend:.1f} MB growth over {len(mem_samples)*30}s", level="ERROR")
-                            log(f"Current RSS: {rss_mb:.1f} MB", level="ERROR")
-                            
-                            # Force aggressive GC
-                            gc.collect()
-                            
-                            new_rss = proc.memory_info().rss / (1024 * 1024)
-                            freed = rss_mb - new_rss
-                            if freed > 1:
-                                log(f"Emergency GC freed {freed:.1f} MB", level="WARNING")
-                    
-                    last_leak_check = time.time()
-        
+            scheduler = HousekeepingScheduler(self._shutdown)
+            scheduler.register(_MEM_LOG_INTERVAL, self._log_rss)
+            scheduler.register(_LEAK_CHECK_INTERVAL, self._leak_check)
+            scheduler.register(_TEMP_CHECK_INTERVAL, self._check_temperature)
+            scheduler.register(_HEALTH_CHECK_INTERVAL, self._check_buffer_health)
+            scheduler.run()
+            log("Shutdown requested - stopping from main thread")
+
         except KeyboardInterrupt:
             print("\n\nReceived keyboard interrupt (Ctrl+C)")
         
@@ -525,19 +666,19 @@ _system = None
 def signal_handler(signum, frame):
     """
     Handle shutdown signals (SIGTERM, SIGINT).
-    
+
     This allows graceful shutdown when:
     - User presses Ctrl+C (SIGINT)
     - systemctl stop is called (SIGTERM)
+
+    Only flips the shutdown event - calling stop() from signal context
+    acquired logger locks and joined threads, which could deadlock if
+    the signal landed while the main thread held one of those locks.
+    The main thread notices the event in run() and drives the actual
+    shutdown itself.
     """
-    global _system
-    
-    signal_name = "SIGTERM" if signum == signal.SIGTERM else "SIGINT"
-    print(f"\n\nReceived {signal_name} signal")
-    log(f"Received {signal_name} signal")
-    
     if _system:
-        _system.stop()
+        _system._shutdown.set()
 
 
 # ============================================================================
@@ -552,8 +693,13 @@ def main():
     
     # Create system instance
     _system = SecurityCameraSystem()
-    
-    # Register signal handlers for graceful shutdown
+
+    # Register signal handlers for graceful shutdown. The wakeup fd
+    # guarantees delivery interrupts any C-level blocking call the main
+    # thread is sitting in (the byte itself is never read - the pipe
+    # only exists for the EINTR).
+    _, wakeup_w = os.pipe2(os.O_NONBLOCK)
+    signal.set_wakeup_fd(wakeup_w)
     signal.signal(signal.SIGTERM, signal_handler)
     signal.signal(signal.SIGINT, signal_handler)
     